@@ -5,8 +5,11 @@ A2L Generator Unit Tests
 
 import unittest
 import tempfile
+import io
 import os
 import sys
+from datetime import datetime
+from unittest import mock
 
 # Add tools directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'tools'))
@@ -17,6 +20,15 @@ from a2l_generator import A2LGenerator
 class TestA2LGenerator(unittest.TestCase):
     """Tests for A2L file generator."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Render shared outputs once for read-only tests."""
+        cls._empty_content = A2LGenerator("TEST_PROJECT", "1.0").generate()
+
+        generator = A2LGenerator("TEST_PROJECT", "1.0")
+        generator.add_standard_ecu_variables()
+        cls._std_content = generator.generate()
+
     def setUp(self):
         """Set up test fixtures."""
         self.generator = A2LGenerator("TEST_PROJECT", "1.0")
@@ -80,9 +92,7 @@ class TestA2LGenerator(unittest.TestCase):
 
     def test_standard_ecu_variables(self):
         """Test adding standard ECU variables."""
-        self.generator.add_standard_ecu_variables()
-
-        content = self.generator.generate()
+        content = self._std_content
 
         # Check for standard measurements
         self.assertIn("engineRPM", content)
@@ -100,24 +110,29 @@ class TestA2LGenerator(unittest.TestCase):
         self.assertIn("CM_TEMP", content)
 
     def test_save_file(self):
-        """Test saving A2L file to disk."""
+        """Test saving A2L content to a file object."""
         self.generator.add_standard_ecu_variables()
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.a2l', delete=False) as f:
-            filepath = f.name
+        buf = io.StringIO()
+        self.generator.save(buf)
+        content = buf.getvalue()
 
-        try:
-            self.generator.save(filepath)
+        self.assertIn("ASAP2_VERSION", content)
+        self.assertIn("engineRPM", content)
 
-            self.assertTrue(os.path.exists(filepath))
+    def test_save_file_path(self):
+        """Test saving A2L content to a file path."""
+        self.generator.add_standard_ecu_variables()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "test.a2l")
+            self.generator.save(filepath)
 
             with open(filepath, 'r') as f:
                 content = f.read()
 
-            self.assertIn("ASAP2_VERSION", content)
-            self.assertIn("engineRPM", content)
-        finally:
-            os.unlink(filepath)
+        self.assertIn("ASAP2_VERSION", content)
+        self.assertIn("engineRPM", content)
 
     def test_measurement_address_format(self):
         """Test that addresses are formatted correctly."""
@@ -147,7 +162,7 @@ class TestA2LGenerator(unittest.TestCase):
 
     def test_record_layouts(self):
         """Test that record layouts are generated."""
-        content = self.generator.generate()
+        content = self._empty_content
 
         self.assertIn("UBYTE_SCALAR", content)
         self.assertIn("UWORD_SCALAR", content)
@@ -156,7 +171,7 @@ class TestA2LGenerator(unittest.TestCase):
 
     def test_mod_common(self):
         """Test MOD_COMMON section."""
-        content = self.generator.generate()
+        content = self._empty_content
 
         self.assertIn("BYTE_ORDER MSB_LAST", content)
         self.assertIn("ALIGNMENT_WORD 2", content)
@@ -212,37 +227,88 @@ class TestA2LGenerator(unittest.TestCase):
 
     def test_empty_generator(self):
         """Test generating with no variables."""
-        content = self.generator.generate()
+        content = self._empty_content
 
         # Should still produce valid structure
         self.assertIn("ASAP2_VERSION", content)
         self.assertIn("/begin PROJECT", content)
         self.assertIn("/end PROJECT", content)
 
-    def test_fuel_control_variables(self):
-        """Test fuel control related variables."""
+    def test_generate_cache_invalidated(self):
+        """Test that adding a variable refreshes cached output."""
+        first = self.generator.generate()
+        self.assertIs(first, self.generator.generate())
+
+        self.generator.add_measurement("cacheTest", 0x20001000, "UWORD")
+        content = self.generator.generate()
+
+        self.assertNotIn("cacheTest", first)
+        self.assertIn("cacheTest", content)
+
+    def test_standard_with_custom_variables(self):
+        """Test custom variables are rendered alongside standard ones."""
         self.generator.add_standard_ecu_variables()
+        self.generator.add_measurement("customVar", 0x20003000, "UWORD")
 
         content = self.generator.generate()
 
+        self.assertIn("engineRPM", content)
+        self.assertIn("customVar", content)
+
+    def test_standard_with_appended_measurement(self):
+        """Test entries appended directly after the standard ones are rendered."""
+        self.generator.add_standard_ecu_variables()
+        self.generator.measurements.append({
+            "name": "appendedVar",
+            "address": 0x20003000,
+            "datatype": "UWORD",
+            "description": "",
+            "unit": "",
+            "lower_limit": 0,
+            "upper_limit": 100,
+            "conversion": "NO_COMPU_METHOD"
+        })
+
+        content = self.generator.generate()
+
+        self.assertIn("engineRPM", content)
+        self.assertIn("appendedVar", content)
+
+    def test_standard_body_matches_rendered(self):
+        """Test the pre-rendered standard body matches rendering each entry."""
+        self.generator.add_standard_ecu_variables()
+
+        # Equal copies of the standard entries take the per-entry render path
+        fallback = A2LGenerator("TEST_PROJECT", "1.0")
+        fallback.compu_methods = [dict(cm) for cm in self.generator.compu_methods]
+        fallback.measurements = [dict(m) for m in self.generator.measurements]
+        fallback.characteristics = [dict(c) for c in self.generator.characteristics]
+
+        self.assertTrue(self.generator._is_standard_only())
+        self.assertFalse(fallback._is_standard_only())
+
+        with mock.patch("a2l_generator.datetime") as mock_datetime:
+            mock_datetime.now.return_value = datetime(2024, 1, 1, 12, 0)
+            self.assertEqual(self.generator.generate(), fallback.generate())
+
+    def test_fuel_control_variables(self):
+        """Test fuel control related variables."""
+        content = self._std_content
+
         self.assertIn("shortTermFuelTrim", content)
         self.assertIn("longTermFuelTrim", content)
         self.assertIn("injectorPulseWidth", content)
 
     def test_knock_control_variables(self):
         """Test knock control variables."""
-        self.generator.add_standard_ecu_variables()
-
-        content = self.generator.generate()
+        content = self._std_content
 
         self.assertIn("knockRetard", content)
         self.assertIn("knockLevel", content)
 
     def test_boost_control_variables(self):
         """Test boost control variables."""
-        self.generator.add_standard_ecu_variables()
-
-        content = self.generator.generate()
+        content = self._std_content
 
         self.assertIn("boostPressure", content)
         self.assertIn("boostTarget", content)
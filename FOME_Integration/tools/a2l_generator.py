@@ -12,7 +12,178 @@ Usage:
 import argparse
 import json
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, TextIO, Union
+
+# Static sections of the A2L file. Per-item blocks end with a blank line so
+# they can be concatenated directly.
+_HEADER_TMPL = """\
+ASAP2_VERSION 1 61
+/begin PROJECT {project} "{project}"
+
+  /begin HEADER "{project}"
+    VERSION "{version}"
+    PROJECT_NO {project}
+  /end HEADER
+
+  /begin MODULE {project}_Module ""
+
+    /begin MOD_COMMON ""
+      BYTE_ORDER MSB_LAST
+      ALIGNMENT_BYTE 1
+      ALIGNMENT_WORD 2
+      ALIGNMENT_LONG 4
+    /end MOD_COMMON
+
+    /begin MOD_PAR ""
+      VERSION "{version}"
+      ADDR_EPK 0x20000000
+      EPK "FOME ECU"
+      CUSTOMER "Open Source"
+      USER "Generated {ts}"
+    /end MOD_PAR
+
+"""
+
+_COMPU_TMPL = """\
+    /begin COMPU_METHOD {name} "{description}"
+      RAT_FUNC "%6.2" "{unit}"
+      COEFFS 0 1 0 0 0 1
+      /begin FORMULA
+        "{formula}"
+      /end FORMULA
+    /end COMPU_METHOD
+
+"""
+
+_RECORD_LAYOUTS = "".join(
+    f"    /begin RECORD_LAYOUT {dt}_SCALAR\n"
+    f"      FNC_VALUES 1 {dt} ROW_DIR DIRECT\n"
+    f"    /end RECORD_LAYOUT\n"
+    f"\n"
+    for dt in ("UBYTE", "SBYTE", "UWORD", "SWORD"))
+
+_MEAS_TMPL = """\
+    /begin MEASUREMENT {name} "{description}"
+      {datatype} {conversion} 1 0 {lower_limit} {upper_limit}
+      ECU_ADDRESS 0x{address:08X}
+{unit_line}    /end MEASUREMENT
+
+"""
+
+_CHAR_TMPL = """\
+    /begin CHARACTERISTIC {name} "{description}"
+      VALUE 0x{address:08X} {datatype}_SCALAR 0 {conversion} {lower_limit} {upper_limit}
+{unit_line}    /end CHARACTERISTIC
+
+"""
+
+_FOOTER = """\
+  /end MODULE
+
+/end PROJECT"""
+
+
+def _unit_line(unit: str) -> str:
+    """PHYS_UNIT line for a measurement/characteristic, empty if no unit."""
+    return f'      PHYS_UNIT "{unit}"\n' if unit else ""
+
+
+def _render_body(compu_methods, measurements, characteristics) -> Iterator[str]:
+    """Yield the compu method, record layout, measurement and characteristic blocks."""
+    for cm in compu_methods:
+        yield _COMPU_TMPL.format_map(cm)
+
+    yield _RECORD_LAYOUTS
+
+    for m in measurements:
+        yield _MEAS_TMPL.format(unit_line=_unit_line(m["unit"]), **m)
+
+    for c in characteristics:
+        yield _CHAR_TMPL.format(unit_line=_unit_line(c["unit"]), **c)
+
+
+# Standard ECU variables, see A2LGenerator.add_standard_ecu_variables()
+_STD_COMPU = (
+    {"name": "CM_RPM", "formula": "X*0.25", "unit": "rpm", "description": "RPM conversion"},
+    {"name": "CM_TEMP", "formula": "X*0.1-40", "unit": "degC", "description": "Temperature conversion"},
+    {"name": "CM_TPS", "formula": "X*0.5", "unit": "%", "description": "Throttle position conversion"},
+    {"name": "CM_AFR", "formula": "X*0.1", "unit": "AFR", "description": "Air-fuel ratio"},
+    {"name": "CM_MAP", "formula": "X*0.1", "unit": "kPa", "description": "Manifold pressure"},
+    {"name": "CM_TIMING", "formula": "X*0.5-20", "unit": "deg", "description": "Ignition timing"},
+    {"name": "CM_VOLTAGE", "formula": "X*0.01", "unit": "V", "description": "Voltage conversion"},
+    {"name": "CM_SPEED", "formula": "X", "unit": "km/h", "description": "Vehicle speed"},
+    {"name": "CM_PRESSURE", "formula": "X*0.1", "unit": "kPa", "description": "Pressure"},
+)
+
+_STD_MEAS = (
+    # Standard measurements
+    {"name": "engineRPM", "address": 0x20001000, "datatype": "UWORD", "description": "Engine speed",
+     "unit": "rpm", "lower_limit": 0, "upper_limit": 10000, "conversion": "CM_RPM"},
+    {"name": "coolantTemp", "address": 0x20001002, "datatype": "SWORD", "description": "Coolant temperature",
+     "unit": "degC", "lower_limit": -40, "upper_limit": 150, "conversion": "CM_TEMP"},
+    {"name": "intakeTemp", "address": 0x20001004, "datatype": "SWORD", "description": "Intake air temperature",
+     "unit": "degC", "lower_limit": -40, "upper_limit": 150, "conversion": "CM_TEMP"},
+    {"name": "throttlePosition", "address": 0x20001006, "datatype": "UBYTE", "description": "Throttle position sensor",
+     "unit": "%", "lower_limit": 0, "upper_limit": 100, "conversion": "CM_TPS"},
+    {"name": "manifoldPressure", "address": 0x20001007, "datatype": "UWORD", "description": "Manifold absolute pressure",
+     "unit": "kPa", "lower_limit": 0, "upper_limit": 300, "conversion": "CM_MAP"},
+    {"name": "airFuelRatio", "address": 0x20001009, "datatype": "UWORD", "description": "Measured air-fuel ratio",
+     "unit": "AFR", "lower_limit": 10, "upper_limit": 20, "conversion": "CM_AFR"},
+    {"name": "ignitionTiming", "address": 0x2000100B, "datatype": "SBYTE", "description": "Current ignition timing",
+     "unit": "deg", "lower_limit": -20, "upper_limit": 60, "conversion": "CM_TIMING"},
+    {"name": "batteryVoltage", "address": 0x2000100C, "datatype": "UWORD", "description": "Battery voltage",
+     "unit": "V", "lower_limit": 0, "upper_limit": 20, "conversion": "CM_VOLTAGE"},
+    {"name": "vehicleSpeed", "address": 0x2000100E, "datatype": "UWORD", "description": "Vehicle speed",
+     "unit": "km/h", "lower_limit": 0, "upper_limit": 300, "conversion": "CM_SPEED"},
+    {"name": "oilPressure", "address": 0x20001010, "datatype": "UWORD", "description": "Engine oil pressure",
+     "unit": "kPa", "lower_limit": 0, "upper_limit": 1000, "conversion": "CM_PRESSURE"},
+
+    # Fuel control measurements
+    {"name": "shortTermFuelTrim", "address": 0x20001020, "datatype": "SBYTE", "description": "Short term fuel trim",
+     "unit": "%", "lower_limit": -25, "upper_limit": 25, "conversion": "NO_COMPU_METHOD"},
+    {"name": "longTermFuelTrim", "address": 0x20001021, "datatype": "SBYTE", "description": "Long term fuel trim",
+     "unit": "%", "lower_limit": -25, "upper_limit": 25, "conversion": "NO_COMPU_METHOD"},
+    {"name": "injectorPulseWidth", "address": 0x20001022, "datatype": "UWORD", "description": "Injector pulse width",
+     "unit": "us", "lower_limit": 0, "upper_limit": 20000, "conversion": "NO_COMPU_METHOD"},
+    {"name": "fuelPressure", "address": 0x20001024, "datatype": "UWORD", "description": "Fuel rail pressure",
+     "unit": "kPa", "lower_limit": 0, "upper_limit": 600, "conversion": "CM_PRESSURE"},
+
+    # Knock control measurements
+    {"name": "knockRetard", "address": 0x20001030, "datatype": "UBYTE", "description": "Knock retard",
+     "unit": "deg", "lower_limit": 0, "upper_limit": 20, "conversion": "NO_COMPU_METHOD"},
+    {"name": "knockLevel", "address": 0x20001031, "datatype": "UBYTE", "description": "Knock sensor level",
+     "unit": "counts", "lower_limit": 0, "upper_limit": 255, "conversion": "NO_COMPU_METHOD"},
+
+    # Boost control measurements
+    {"name": "boostPressure", "address": 0x20001040, "datatype": "UWORD", "description": "Boost pressure",
+     "unit": "kPa", "lower_limit": 0, "upper_limit": 300, "conversion": "CM_MAP"},
+    {"name": "boostTarget", "address": 0x20001042, "datatype": "UWORD", "description": "Boost target",
+     "unit": "kPa", "lower_limit": 0, "upper_limit": 300, "conversion": "CM_MAP"},
+    {"name": "wastegatePosition", "address": 0x20001044, "datatype": "UBYTE", "description": "Wastegate position",
+     "unit": "%", "lower_limit": 0, "upper_limit": 100, "conversion": "NO_COMPU_METHOD"},
+)
+
+_STD_CHAR = (
+    # Standard characteristics (calibratable)
+    {"name": "idleRPMTarget", "address": 0x20002000, "datatype": "UWORD", "description": "Target idle RPM",
+     "unit": "rpm", "lower_limit": 500, "upper_limit": 2000, "conversion": "CM_RPM"},
+    {"name": "fuelMapBaseValue", "address": 0x20002002, "datatype": "UWORD", "description": "Base fuel map value",
+     "unit": "ms", "lower_limit": 0, "upper_limit": 20, "conversion": "NO_COMPU_METHOD"},
+    {"name": "ignitionMapBaseValue", "address": 0x20002004, "datatype": "SBYTE", "description": "Base ignition timing",
+     "unit": "deg", "lower_limit": -20, "upper_limit": 60, "conversion": "CM_TIMING"},
+    {"name": "boostTargetMax", "address": 0x20002005, "datatype": "UWORD", "description": "Maximum boost target",
+     "unit": "kPa", "lower_limit": 0, "upper_limit": 300, "conversion": "CM_MAP"},
+    {"name": "revLimit", "address": 0x20002007, "datatype": "UWORD", "description": "Engine rev limit",
+     "unit": "rpm", "lower_limit": 0, "upper_limit": 12000, "conversion": "CM_RPM"},
+    {"name": "launchRPM", "address": 0x20002009, "datatype": "UWORD", "description": "Launch control RPM",
+     "unit": "rpm", "lower_limit": 2000, "upper_limit": 6000, "conversion": "CM_RPM"},
+    {"name": "tractionSlipTarget", "address": 0x2000200B, "datatype": "UBYTE", "description": "Traction control slip target",
+     "unit": "%", "lower_limit": 0, "upper_limit": 30, "conversion": "NO_COMPU_METHOD"},
+)
+
+# Body for a generator holding only the standard variables (--standard)
+_STD_BODY = "".join(_render_body(_STD_COMPU, _STD_MEAS, _STD_CHAR))
+
 
 class A2LGenerator:
     """Generates A2L files from variable definitions."""
@@ -24,12 +195,15 @@ class A2LGenerator:
         self.characteristics: List[Dict[str, Any]] = []
         self.compu_methods: List[Dict[str, Any]] = []
         self.record_layouts: List[Dict[str, Any]] = []
+        # Rendered output, reset by the add_* methods
+        self._cached_output: Optional[str] = None
 
     def add_measurement(self, name: str, address: int, datatype: str,
                        description: str = "", unit: str = "",
                        lower_limit: float = 0, upper_limit: float = 100,
                        conversion: str = "NO_COMPU_METHOD"):
         """Add a measurement variable (read-only from ECU)."""
+        self._cached_output = None
         self.measurements.append({
             "name": name,
             "address": address,
@@ -46,6 +220,7 @@ class A2LGenerator:
                           lower_limit: float = 0, upper_limit: float = 100,
                           conversion: str = "NO_COMPU_METHOD"):
         """Add a characteristic variable (calibratable parameter)."""
+        self._cached_output = None
         self.characteristics.append({
             "name": name,
             "address": address,
@@ -60,6 +235,7 @@ class A2LGenerator:
     def add_compu_method(self, name: str, formula: str, unit: str,
                         description: str = ""):
         """Add a computation method for unit conversion."""
+        self._cached_output = None
         self.compu_methods.append({
             "name": name,
             "formula": formula,
@@ -68,173 +244,49 @@ class A2LGenerator:
         })
 
     def add_standard_ecu_variables(self):
-        """Add standard ECU measurements and characteristics."""
-
-        # Computation methods
-        self.add_compu_method("CM_RPM", "X*0.25", "rpm", "RPM conversion")
-        self.add_compu_method("CM_TEMP", "X*0.1-40", "degC", "Temperature conversion")
-        self.add_compu_method("CM_TPS", "X*0.5", "%", "Throttle position conversion")
-        self.add_compu_method("CM_AFR", "X*0.1", "AFR", "Air-fuel ratio")
-        self.add_compu_method("CM_MAP", "X*0.1", "kPa", "Manifold pressure")
-        self.add_compu_method("CM_TIMING", "X*0.5-20", "deg", "Ignition timing")
-        self.add_compu_method("CM_VOLTAGE", "X*0.01", "V", "Voltage conversion")
-        self.add_compu_method("CM_SPEED", "X", "km/h", "Vehicle speed")
-        self.add_compu_method("CM_PRESSURE", "X*0.1", "kPa", "Pressure")
-
-        # Standard measurements
-        self.add_measurement("engineRPM", 0x20001000, "UWORD",
-                           "Engine speed", "rpm", 0, 10000, "CM_RPM")
-        self.add_measurement("coolantTemp", 0x20001002, "SWORD",
-                           "Coolant temperature", "degC", -40, 150, "CM_TEMP")
-        self.add_measurement("intakeTemp", 0x20001004, "SWORD",
-                           "Intake air temperature", "degC", -40, 150, "CM_TEMP")
-        self.add_measurement("throttlePosition", 0x20001006, "UBYTE",
-                           "Throttle position sensor", "%", 0, 100, "CM_TPS")
-        self.add_measurement("manifoldPressure", 0x20001007, "UWORD",
-                           "Manifold absolute pressure", "kPa", 0, 300, "CM_MAP")
-        self.add_measurement("airFuelRatio", 0x20001009, "UWORD",
-                           "Measured air-fuel ratio", "AFR", 10, 20, "CM_AFR")
-        self.add_measurement("ignitionTiming", 0x2000100B, "SBYTE",
-                           "Current ignition timing", "deg", -20, 60, "CM_TIMING")
-        self.add_measurement("batteryVoltage", 0x2000100C, "UWORD",
-                           "Battery voltage", "V", 0, 20, "CM_VOLTAGE")
-        self.add_measurement("vehicleSpeed", 0x2000100E, "UWORD",
-                           "Vehicle speed", "km/h", 0, 300, "CM_SPEED")
-        self.add_measurement("oilPressure", 0x20001010, "UWORD",
-                           "Engine oil pressure", "kPa", 0, 1000, "CM_PRESSURE")
-
-        # Fuel control measurements
-        self.add_measurement("shortTermFuelTrim", 0x20001020, "SBYTE",
-                           "Short term fuel trim", "%", -25, 25)
-        self.add_measurement("longTermFuelTrim", 0x20001021, "SBYTE",
-                           "Long term fuel trim", "%", -25, 25)
-        self.add_measurement("injectorPulseWidth", 0x20001022, "UWORD",
-                           "Injector pulse width", "us", 0, 20000)
-        self.add_measurement("fuelPressure", 0x20001024, "UWORD",
-                           "Fuel rail pressure", "kPa", 0, 600, "CM_PRESSURE")
-
-        # Knock control measurements
-        self.add_measurement("knockRetard", 0x20001030, "UBYTE",
-                           "Knock retard", "deg", 0, 20)
-        self.add_measurement("knockLevel", 0x20001031, "UBYTE",
-                           "Knock sensor level", "counts", 0, 255)
-
-        # Boost control measurements
-        self.add_measurement("boostPressure", 0x20001040, "UWORD",
-                           "Boost pressure", "kPa", 0, 300, "CM_MAP")
-        self.add_measurement("boostTarget", 0x20001042, "UWORD",
-                           "Boost target", "kPa", 0, 300, "CM_MAP")
-        self.add_measurement("wastegatePosition", 0x20001044, "UBYTE",
-                           "Wastegate position", "%", 0, 100)
-
-        # Standard characteristics (calibratable)
-        self.add_characteristic("idleRPMTarget", 0x20002000, "UWORD",
-                              "Target idle RPM", "rpm", 500, 2000, "CM_RPM")
-        self.add_characteristic("fuelMapBaseValue", 0x20002002, "UWORD",
-                              "Base fuel map value", "ms", 0, 20)
-        self.add_characteristic("ignitionMapBaseValue", 0x20002004, "SBYTE",
-                              "Base ignition timing", "deg", -20, 60, "CM_TIMING")
-        self.add_characteristic("boostTargetMax", 0x20002005, "UWORD",
-                              "Maximum boost target", "kPa", 0, 300, "CM_MAP")
-        self.add_characteristic("revLimit", 0x20002007, "UWORD",
-                              "Engine rev limit", "rpm", 0, 12000, "CM_RPM")
-        self.add_characteristic("launchRPM", 0x20002009, "UWORD",
-                              "Launch control RPM", "rpm", 2000, 6000, "CM_RPM")
-        self.add_characteristic("tractionSlipTarget", 0x2000200B, "UBYTE",
-                              "Traction control slip target", "%", 0, 30)
+        """Add standard ECU measurements and characteristics.
+
+        The entries are shared with _STD_* and must be treated as read-only;
+        replace an entry with a copy to change it.
+        """
+        self._cached_output = None
+        self.compu_methods.extend(_STD_COMPU)
+        self.measurements.extend(_STD_MEAS)
+        self.characteristics.extend(_STD_CHAR)
+
+    def iter_blocks(self) -> Iterator[str]:
+        """Yield the A2L file content one section or variable at a time."""
+        yield _HEADER_TMPL.format(
+            project=self.project_name,
+            version=self.version,
+            ts=datetime.now().strftime("%Y-%m-%d %H:%M"))
+
+        if self._is_standard_only():
+            yield _STD_BODY
+        else:
+            yield from _render_body(self.compu_methods, self.measurements,
+                                    self.characteristics)
+
+        yield _FOOTER
+
+    def _is_standard_only(self) -> bool:
+        """Check whether the lists hold exactly the shared standard entries."""
+        for entries, std in ((self.compu_methods, _STD_COMPU),
+                             (self.measurements, _STD_MEAS),
+                             (self.characteristics, _STD_CHAR)):
+            if len(entries) != len(std) or not all(a is b for a, b in zip(entries, std)):
+                return False
+        return True
 
     def generate(self) -> str:
-        """Generate the A2L file content."""
-        lines = []
-
-        # Header
-        lines.append("ASAP2_VERSION 1 61")
-        lines.append(f'/begin PROJECT {self.project_name} "{self.project_name}"')
-        lines.append("")
-        lines.append(f'  /begin HEADER "{self.project_name}"')
-        lines.append(f'    VERSION "{self.version}"')
-        lines.append(f'    PROJECT_NO {self.project_name}')
-        lines.append("  /end HEADER")
-        lines.append("")
-
-        # Module
-        lines.append(f'  /begin MODULE {self.project_name}_Module ""')
-        lines.append("")
-
-        # MOD_COMMON
-        lines.append("    /begin MOD_COMMON \"\"")
-        lines.append("      BYTE_ORDER MSB_LAST")
-        lines.append("      ALIGNMENT_BYTE 1")
-        lines.append("      ALIGNMENT_WORD 2")
-        lines.append("      ALIGNMENT_LONG 4")
-        lines.append("    /end MOD_COMMON")
-        lines.append("")
-
-        # MOD_PAR
-        lines.append("    /begin MOD_PAR \"\"")
-        lines.append(f'      VERSION "{self.version}"')
-        lines.append('      ADDR_EPK 0x20000000')
-        lines.append('      EPK "FOME ECU"')
-        lines.append("      CUSTOMER \"Open Source\"")
-        lines.append(f'      USER "Generated {datetime.now().strftime("%Y-%m-%d %H:%M")}"')
-        lines.append("    /end MOD_PAR")
-        lines.append("")
-
-        # Computation methods
-        for cm in self.compu_methods:
-            lines.append(f'    /begin COMPU_METHOD {cm["name"]} "{cm["description"]}"')
-            lines.append(f'      RAT_FUNC "%6.2" "{cm["unit"]}"')
-            lines.append(f'      COEFFS 0 1 0 0 0 1')
-            lines.append(f'      /begin FORMULA')
-            lines.append(f'        "{cm["formula"]}"')
-            lines.append(f'      /end FORMULA')
-            lines.append(f'    /end COMPU_METHOD')
-            lines.append("")
-
-        # Record layouts
-        lines.append("    /begin RECORD_LAYOUT UBYTE_SCALAR")
-        lines.append("      FNC_VALUES 1 UBYTE ROW_DIR DIRECT")
-        lines.append("    /end RECORD_LAYOUT")
-        lines.append("")
-        lines.append("    /begin RECORD_LAYOUT SBYTE_SCALAR")
-        lines.append("      FNC_VALUES 1 SBYTE ROW_DIR DIRECT")
-        lines.append("    /end RECORD_LAYOUT")
-        lines.append("")
-        lines.append("    /begin RECORD_LAYOUT UWORD_SCALAR")
-        lines.append("      FNC_VALUES 1 UWORD ROW_DIR DIRECT")
-        lines.append("    /end RECORD_LAYOUT")
-        lines.append("")
-        lines.append("    /begin RECORD_LAYOUT SWORD_SCALAR")
-        lines.append("      FNC_VALUES 1 SWORD ROW_DIR DIRECT")
-        lines.append("    /end RECORD_LAYOUT")
-        lines.append("")
-
-        # Measurements
-        for m in self.measurements:
-            lines.append(f'    /begin MEASUREMENT {m["name"]} "{m["description"]}"')
-            lines.append(f'      {m["datatype"]} {m["conversion"]} 1 0 {m["lower_limit"]} {m["upper_limit"]}')
-            lines.append(f'      ECU_ADDRESS 0x{m["address"]:08X}')
-            if m["unit"]:
-                lines.append(f'      PHYS_UNIT "{m["unit"]}"')
-            lines.append(f'    /end MEASUREMENT')
-            lines.append("")
-
-        # Characteristics
-        for c in self.characteristics:
-            record_layout = f'{c["datatype"]}_SCALAR'
-            lines.append(f'    /begin CHARACTERISTIC {c["name"]} "{c["description"]}"')
-            lines.append(f'      VALUE 0x{c["address"]:08X} {record_layout} 0 {c["conversion"]} {c["lower_limit"]} {c["upper_limit"]}')
-            if c["unit"]:
-                lines.append(f'      PHYS_UNIT "{c["unit"]}"')
-            lines.append(f'    /end CHARACTERISTIC')
-            lines.append("")
-
-        # Close module and project
-        lines.append(f"  /end MODULE")
-        lines.append("")
-        lines.append(f"/end PROJECT")
-
-        return "\n".join(lines)
+        """Generate the A2L file content.
+
+        The result is cached until the next add_* call; lists mutated
+        directly are not tracked.
+        """
+        if self._cached_output is None:
+            self._cached_output = "".join(self.iter_blocks())
+        return self._cached_output
 
     def load_from_json(self, filepath: str):
         """Load variable definitions from JSON file."""
@@ -253,11 +305,15 @@ class A2LGenerator:
             for c in config["characteristics"]:
                 self.add_characteristic(**c)
 
-    def save(self, filepath: str):
-        """Save A2L content to file."""
-        content = self.generate()
+    def save(self, filepath: Union[str, TextIO]):
+        """Save A2L content to a file path or a writable text file object."""
+        # Always re-render so the header timestamp reflects the save time
+        if hasattr(filepath, "write"):
+            filepath.writelines(self.iter_blocks())
+            return
+
         with open(filepath, 'w') as f:
-            f.write(content)
+            f.writelines(self.iter_blocks())
         print(f"Generated A2L file: {filepath}")
 
 
@@ -30,14 +30,28 @@ def main():
     # test rx-8 instrument cluster with fixed values
     data = DashPacket(engine_rate=903.4, speed=27.77)
 
-    message = codec.pack(*data.to_tuple())
+    message = codec.pack(data.to_tuple())
     sock = socket.socket(family=socket.AF_INET, type=socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 65536)
+    # fixed destination, connect once so each send skips address handling
+    sock.connect((ip, port))
 
     print("Sending data to UDP server {ip}:{port}".format(ip=ip, port=port))
+    # simulate data transfer at 60fps, scheduled against a fixed deadline
+    # so sleep overshoot doesn't accumulate
+    interval = 1 / 60
+    next_send = time.perf_counter()
     try:
         while(True):
-            sock.sendto(message, (ip, port))
-            time.sleep(0.01666) # simulate data transfer at 60fps
+            try:
+                sock.send(message)
+            except ConnectionRefusedError:
+                pass # connected UDP socket reports ICMP errors, server not up yet
+            next_send += interval
+            now = time.perf_counter()
+            if next_send < now:
+                next_send = now # fell behind (e.g. after a stall), resync instead of bursting
+            time.sleep(next_send - now)
     except KeyboardInterrupt:
         print("\nExiting...")
 
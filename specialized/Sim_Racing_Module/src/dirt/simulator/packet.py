@@ -1,8 +1,14 @@
+import operator
 import struct
+import sys
 
-from dataclasses import dataclass, astuple
+from collections import namedtuple
+from dataclasses import dataclass, fields
 
-@dataclass
+# slots=True needs Python 3.10+, older versions get a plain dataclass
+_DATACLASS_OPTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_OPTS)
 class DashPacket:
     time: float = 0.0
     lap_time: float = 0.0
@@ -81,23 +87,72 @@ class DashPacket:
         return "RPM: {rpm:.2f} Speed: {speed:.2f}".format(rpm=(self.engine_rate * 10), speed=(self.speed * 3.6))
 
     def to_tuple(self):
-        return astuple(self)
+        return _GET_ALL(self)
+
+# reads every field in declaration order in one call; unlike astuple it
+# doesn't deep-copy, which the flat float/int fields don't need
+_FIELDS = tuple(f.name for f in fields(DashPacket))
+_GET_ALL = operator.attrgetter(*_FIELDS)
+
+class DashSample(namedtuple('DashSample', ['engine_rate', 'speed'])):
+    # just the DashPacket fields the dash uses, printed the same way
+    __slots__ = ()
+
+    __str__ = DashPacket.__str__
+
+    def to_packet(self) -> DashPacket:
+        return DashPacket(engine_rate=self.engine_rate, speed=self.speed)
 
 class DashCodec:
     # TODO: how many floats are expected 60 or 70?
-    format: str = '<ffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffff'
+    format: bytes = b'<ffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffff'
+
+    # compiled once at import, shared by all codec instances
+    _struct = struct.Struct(format)
+    BUFFER_SIZE = _struct.size
+
+    # the fields unpack() needs, read in one call: speed (float 7) and
+    # engine_rate (float 37), pad bytes skip the rest without decoding
+    _sample = struct.Struct('<28xf116xf')
+
+    # numpy structured dtype for unpack_many(), built on first use
+    _dtype = None
 
     def buffer_size(self):
-        return struct.calcsize(self.format)
+        return self.BUFFER_SIZE
+
+    def unpack(self, data, offset=0) -> DashSample:
+        # only care about this data (for now), so read just these fields
+        # instead of unpacking all of them. data may be bytes, bytearray or
+        # memoryview, e.g. a reused receive buffer
+        speed, rpm = self._sample.unpack_from(data, offset)
+
+        return DashSample(rpm, speed)
+
+    def unpack_full(self, data, offset=0) -> DashPacket:
+        return DashPacket(*self._struct.unpack_from(data, offset))
+
+    def iter_unpack(self, data):
+        # iterate the field tuples of back-to-back packets (e.g. replaying a
+        # recorded session) without a Python-level unpack call per packet;
+        # len(data) must be a multiple of buffer_size()
+        return self._struct.iter_unpack(data)
 
-    def unpack(self, data) -> DashPacket:
-        data = struct.unpack(self.format, data)
+    def unpack_many(self, data, count=-1):
+        # decode back-to-back packets (e.g. a recorded session) in one call
+        # into a numpy structured array, one row per packet, columns named
+        # after the DashPacket fields. numpy is only needed for this method,
+        # the dtype is built on first use and shared by all codec instances
+        import numpy as np
 
-        # only care about this data (for now)
-        speed = data[7]
-        rpm = data[37]
+        if DashCodec._dtype is None:
+            DashCodec._dtype = np.dtype([(name, '<f4') for name in _FIELDS])
+        return np.frombuffer(data, dtype=self._dtype, count=count)
 
-        return DashPacket(engine_rate=rpm, speed=speed)
+    def pack(self, data) -> bytes:
+        # data is the sequence of field values, e.g. DashPacket.to_tuple()
+        return self._struct.pack(*data)
 
-    def pack(self, *data) -> DashPacket:
-        return struct.pack(self.format, *data)
+    def pack_into(self, buffer, offset, data):
+        # encode into a preallocated, reusable bytearray of buffer_size()
+        self._struct.pack_into(buffer, offset, *data)
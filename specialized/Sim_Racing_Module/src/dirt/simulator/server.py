@@ -1,9 +1,12 @@
 import argparse
 from datetime import datetime
 import socket
+import time
 
 from packet import DashCodec, DashPacket
 
+PRINT_INTERVAL = 0.1 # seconds
+
 
 def process_arguments():
     parser = argparse.ArgumentParser(description="Dirt Rally 2.0 UDP server test utility")
@@ -31,11 +34,26 @@ def main():
 
     codec = DashCodec()
 
+    # printing every packet can't keep up with the game's send rate,
+    # so only show the latest packet every PRINT_INTERVAL seconds
+    last_print = 0.0
+    # receive into one reusable buffer instead of allocating bytes per packet
+    buffer = bytearray(codec.buffer_size())
+    view = memoryview(buffer)
+    size_warned = False
     try:
         while(True):
-            message, address = sock.recvfrom(codec.buffer_size())
-            data = codec.unpack(message)
-            print("{timestamp} -- {data}".format(timestamp=datetime.now(), data=data))
+            size = sock.recv_into(buffer)
+            if size != codec.BUFFER_SIZE and not size_warned:
+                print("Warning: received {size} byte packet, expected {expected}".format(
+                    size=size, expected=codec.BUFFER_SIZE))
+                size_warned = True
+            # unpack_from bounds-checks the slice, too short a packet raises struct.error
+            data = codec.unpack(view[:size])
+            now = time.monotonic()
+            if now - last_print >= PRINT_INTERVAL:
+                print("{timestamp} -- {data}".format(timestamp=datetime.now(), data=data))
+                last_print = now
     except KeyboardInterrupt:
         print("\nExiting...")
 
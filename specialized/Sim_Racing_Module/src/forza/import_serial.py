@@ -2,16 +2,16 @@ import serial
 import pyautogui
 Arduino_Serial = serial.Serial('COM7', 9600) # Arduino Uno is connected on COM7
 
-handbrakeStatus = 1 # 1 = on, 0 = off
+handbrake_on = False
 
 while 1:
-    incoming_data = str(Arduino_Serial.readline())
-    print(incoming_data)
-    if 'pressK' in incoming_data:
+    line = Arduino_Serial.readline()
+    print(line)
+    want_on = b'pressK' in line
+    # only send key events when the handbrake state changes
+    if want_on and not handbrake_on:
         pyautogui.keyDown('k')
-        handbrakeStatus = 1
-    else:
-        if handbrakeStatus == 1:
-            pyautogui.keyUp('k')
-            handbrakeStatus = 0
-    incoming_data = ""
\ No newline at end of file
+        handbrake_on = True
+    elif handbrake_on and not want_on:
+        pyautogui.keyUp('k')
+        handbrake_on = False
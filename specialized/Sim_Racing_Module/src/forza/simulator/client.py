@@ -30,7 +30,7 @@ def main():
     # test rx-8 instrument cluster with fixed values
     data = DashPacket(is_race_on=1, current_engine_rpm=903.4, speed=27.77)
 
-    message = codec.pack(*data.to_tuple())
+    message = codec.pack(data.to_tuple())
     sock = socket.socket(family=socket.AF_INET, type=socket.SOCK_DGRAM)
 
     print("Sending data to UDP server {ip}:{port}".format(ip=ip, port=port))
@@ -1,9 +1,16 @@
+import ctypes
+import operator
 import struct
+import sys
 
-from dataclasses import dataclass, astuple
+from collections import namedtuple
+from dataclasses import dataclass, fields
 
+# slots=True needs Python 3.10+, older versions get a plain dataclass
+_DATACLASS_OPTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_DATACLASS_OPTS)
 class DashPacket:
     # V1 'sled'
     is_race_on: int = 0
@@ -121,118 +128,100 @@ class DashPacket:
     normalized_driving_line: int = 0
     normalized_a_i_brake_difference: int = 0
 
-    # convenience to positionally reference index of unpacked data
-    labels = ['is_race_on',
-              'timestamp_m_s',
-              'engine_max_rpm',
-              'engine_idle_rpm',
-              'current_engine_rpm',
-              'acceleration_x',
-              'acceleration_y',
-              'acceleration_z',
-              'velocity_x',
-              'velocity_y',
-              'velocity_z',
-              'angular_velocity_x',
-              'angular_velocity_y',
-              'angular_velocity_z',
-              'yaw',
-              'pitch',
-              'roll',
-              'normalized_suspension_travel_front_left',
-              'normalized_suspension_travel_front_right',
-              'normalized_suspension_travel_rear_left',
-              'normalized_suspension_travel_rear_right',
-              'tire_slip_ratio_front_left',
-              'tire_slip_ratio_front_right',
-              'tire_slip_ratio_rear_left',
-              'tire_slip_ratio_rear_right',
-              'wheel_rotation_speed_front_left',
-              'wheel_rotation_speed_front_right',
-              'wheel_rotation_speed_rear_left',
-              'wheel_rotation_speed_rear_right',
-              'wheel_on_rumble_strip_front_left',
-              'wheel_on_rumble_strip_front_right',
-              'wheel_on_rumble_strip_rear_left',
-              'wheel_on_rumble_strip_rear_right',
-              'wheel_in_puddle_depth_front_left',
-              'wheel_in_puddle_depth_front_right',
-              'wheel_in_puddle_depth_rear_left',
-              'wheel_in_puddle_depth_rear_right',
-              'surface_rumble_front_left',
-              'surface_rumble_front_right',
-              'surface_rumble_rear_left',
-              'surface_rumble_rear_right',
-              'tire_slip_angle_front_left',
-              'tire_slip_angle_front_right',
-              'tire_slip_angle_rear_left',
-              'tire_slip_angle_rear_right',
-              'tire_combined_slip_front_left',
-              'tire_combined_slip_front_right',
-              'tire_combined_slip_rear_left',
-              'tire_combined_slip_rear_right',
-              'suspension_travel_meters_front_left',
-              'suspension_travel_meters_front_right',
-              'suspension_travel_meters_rear_left',
-              'suspension_travel_meters_rear_right',
-              'car_ordinal',
-              'car_class',
-              'car_performance_index',
-              'drivetrain_type',
-              'num_cylinders',
-              'position_x',
-              'position_y',
-              'position_z',
-              'offset0',
-              'offset1',
-              'offset2',
-              'speed',
-              'power',
-              'torque',
-              'tire_temp_front_left',
-              'tire_temp_front_right',
-              'tire_temp_rear_left',
-              'tire_temp_rear_right',
-              'boost',
-              'fuel',
-              'distance_traveled',
-              'best_lap',
-              'last_lap',
-              'current_lap',
-              'current_race_time',
-              'lap_number',
-              'race_position',
-              'accel',
-              'brake',
-              'clutch',
-              'hand_brake',
-              'gear',
-              'steer',
-              'normalized_driving_line',
-              'normalized_a_i_brake_difference']
-
     def __str__(self):
         return "current_engine_rpm: {rpm:.2f}, speed: {speed:.2f}".format(rpm=self.current_engine_rpm, speed=self.speed)
 
     def to_tuple(self):
-        return astuple(self)
+        return _GET_ALL(self)
 
+# convenience to positionally reference index of unpacked data, in wire order
+LABELS = tuple(f.name for f in fields(DashPacket))
+LABEL_IDX = {name: i for i, name in enumerate(LABELS)}
+DashPacket.labels = LABELS
 
-class DashCodec:
-    format: str = '<iIfffffffffffffffffffffffffffffffffffffffffffffffffffiiiiiffffffffffffffffffffHBBBBBBbbb'
+# reads every field in declaration order in one call; unlike astuple it
+# doesn't deep-copy, which the flat float/int fields don't need
+_GET_ALL = operator.attrgetter(*LABELS)
 
-    def buffer_size(self):
-        return struct.calcsize(self.format)
 
-    def unpack(self, data) -> DashPacket:
-        data = struct.unpack(self.format, data)
+class DashSample(namedtuple('DashSample', ['is_race_on', 'current_engine_rpm', 'speed'])):
+    # just the DashPacket fields the dash uses, printed the same way
+    __slots__ = ()
+
+    __str__ = DashPacket.__str__
 
-        # only care about this data (for now)
-        on = data[DashPacket.labels.index('is_race_on')]
-        rpm = data[DashPacket.labels.index('current_engine_rpm')]
-        speed = data[DashPacket.labels.index('speed')]
+    def to_packet(self) -> DashPacket:
+        return DashPacket(is_race_on=self.is_race_on, current_engine_rpm=self.current_engine_rpm, speed=self.speed)
 
-        return DashPacket(is_race_on=on, current_engine_rpm=rpm, speed=speed)
 
-    def pack(self, *data) -> DashPacket:
-        return struct.pack(self.format, *data)
+class DashCodec:
+    format: bytes = b'<iIfffffffffffffffffffffffffffffffffffffffffffffffffffiiiiiffffffffffffffffffffHBBBBBBbbb'
+
+    # compiled once at import, shared by all codec instances
+    _struct = struct.Struct(format)
+    BUFFER_SIZE = _struct.size
+
+    # the fields unpack() needs, read in one call: is_race_on (byte 0),
+    # current_engine_rpm (byte 16) and speed (byte 256), pad bytes skip the
+    # rest without decoding
+    _sample = struct.Struct('<i12xf236xf')
+
+    # numpy structured dtype for unpack_many(), built on first use
+    _dtype = None
+
+    def buffer_size(self):
+        return self.BUFFER_SIZE
+
+    def unpack(self, data, offset=0) -> DashSample:
+        # only care about this data (for now), so read just these fields
+        # instead of unpacking all of them. data may be bytes, bytearray or
+        # memoryview, e.g. a reused receive buffer
+        return DashSample._make(self._sample.unpack_from(data, offset))
+
+    def unpack_full(self, data, offset=0) -> DashPacket:
+        return DashPacket(*self._struct.unpack_from(data, offset))
+
+    def view(self, data, offset=0) -> 'RawDashPacket':
+        # ctypes view of the whole packet, fields are only converted to
+        # Python objects when read. Writable buffers (e.g. a bytearray receive
+        # buffer) are viewed in place, so the view follows the next packet
+        # received into it; read-only bytes are copied once
+        try:
+            return RawDashPacket.from_buffer(data, offset)
+        except TypeError:
+            return RawDashPacket.from_buffer_copy(data, offset)
+
+    def iter_unpack(self, data):
+        # iterate the field tuples of back-to-back packets (e.g. replaying a
+        # recorded session) without a Python-level unpack call per packet;
+        # len(data) must be a multiple of buffer_size()
+        return self._struct.iter_unpack(data)
+
+    def unpack_many(self, data, count=-1):
+        # decode back-to-back packets (e.g. a recorded session) in one call
+        # into a numpy structured array, one row per packet, columns named
+        # after the DashPacket fields. numpy is only needed for this method,
+        # the dtype is built on first use and shared by all codec instances
+        import numpy as np
+
+        if DashCodec._dtype is None:
+            DashCodec._dtype = np.dtype([(name, '<' + code) for name, code in zip(LABELS, self._struct.format[1:])])
+        return np.frombuffer(data, dtype=self._dtype, count=count)
+
+    def pack(self, data) -> bytes:
+        # data is the sequence of field values, e.g. DashPacket.to_tuple()
+        return self._struct.pack(*data)
+
+    def pack_into(self, buffer, offset, data):
+        # encode into a preallocated, reusable bytearray of buffer_size()
+        self._struct.pack_into(buffer, offset, *data)
+
+
+_CTYPES = {'i': ctypes.c_int32, 'I': ctypes.c_uint32, 'f': ctypes.c_float,
+           'H': ctypes.c_uint16, 'B': ctypes.c_uint8, 'b': ctypes.c_int8}
+
+
+class RawDashPacket(ctypes.LittleEndianStructure):
+    # packed C layout of the wire format, same field names as DashPacket
+    _pack_ = 1
+    _fields_ = [(name, _CTYPES[code]) for name, code in zip(LABELS, DashCodec._struct.format[1:])]
@@ -31,10 +31,19 @@ def main():
 
     codec = DashCodec()
 
+    # receive into one reusable buffer instead of allocating bytes per packet
+    buffer = bytearray(codec.buffer_size())
+    view = memoryview(buffer)
+    size_warned = False
     try:
         while(True):
-            message, address = sock.recvfrom(codec.buffer_size())
-            data = codec.unpack(message)
+            size = sock.recv_into(buffer)
+            if size != codec.BUFFER_SIZE and not size_warned:
+                print("Warning: received {size} byte packet, expected {expected}".format(
+                    size=size, expected=codec.BUFFER_SIZE))
+                size_warned = True
+            # unpack_from bounds-checks the slice, too short a packet raises struct.error
+            data = codec.unpack(view[:size])
             print("{timestamp} -- {data}".format(timestamp=datetime.now(), data=data))
     except KeyboardInterrupt:
         print("\nExiting...")
@@ -8,102 +8,81 @@
                                 # 3 - 0x38 from #2 start
 
 import argparse
-import re
+import sys
 
 address1_offset = 0x4A
 address2_offset = 0x4
 address3_offset = 0x38
 w_rke_offset = 0xf7 + 0x355
 
-immo_start_pattern ="B56E000960D0600C88008D1100098801"
+immo_start_pattern = bytes.fromhex("B56E000960D0600C88008D1100098801")
 
 output_file = "defs.txt"
 
+#Immo patch state data, "on" and "off" only differ in how they start and in the last byte
+immo_patch_on_start = ("00 09 00 09 00 09 B3 D5 00 09 00 09 00 09 00 09 00 09 00 09 00 09 00\n"
+                       "\t\t\t09 00 09 00 09 00 09 00 09 00 09 00 09 00 09 00 09 00 09 00 09 00 09\n"
+                       "\t\t\t00 09 00 09 00 09 ")
+
+immo_patch_off_start = ("B5 6E 00 09 60 D0 60 0C 88 00 8D 11 00 09 88 01 8D 3A 00 09 88 02 8D\n"
+                        "\t\t\t3B 00 09 88 03 8D 3C 00 09 88 04 8D 3D 00 09 88 05 8D 3E 00 09 A0 40\n"
+                        "\t\t\t00 09 B0 8C 00 09 ")
+
+immo_patch_body = ("A0 3D 00 09 01 F4 00 FA 55 AA AA CC B5 C4 FF FF FF\n"
+                   "\t\t\tFF 86 9C 00 03 {val1} 00 03 {val2} FF FF C2 28 FF FF C2 2C FF FF C2 3E\n"
+                   "\t\t\tFF FF C2 3A FF FF C2 88 FF FF C2 8C 00 01 00 01 55 AA 55 AA 00 00 FF\n"
+                   "\t\t\tFF FF FF C2 96 FF FF C2 98 00 00 B7 E3 FF FF C2 39 00 03 {val3} B0 BB\n"
+                   "\t\t\t00 09 A0 11 00 09 B1 CF 00 09 A0 0D 00 09 B2 5B 00 09 A0 09 00 09 B2\n"
+                   "\t\t\tFD 00 09 A0 05 00 09 B3 4E 00 09 A0 01 00 09 2D E0 DD 30 D2 30 64 20\n"
+                   "\t\t\t60 4C 88 05 8D 04 64 03 60 43 88 06 8F 10 00 09 D2 2C 63 20 23 38 8F\n"
+                   "\t\t\t0B 00 09 D1 2B 60 10 20 08 8F 06 00 09 D2 29 E5 01 42 0B 64 D0 A0 01\n"
+                   "\t\t\t2D 00 2D E0 E3 03 62 D0 62 2C 32 33 8F 0D 00 09 E1 {tail}")
+
 #Search input bin file for ECU ID
-def search_input(input_binary_filename):
+def search_input(rom):
 
-    with open(input_binary_filename, 'rb') as file:
-        file.seek(0x2000)
-        data = file.read(8)
-        input_ecu_id = data.decode()
-        print("ECU ID Found: %s" %input_ecu_id)
+    input_ecu_id = rom[0x2000:0x2008].decode()
+    print("ECU ID Found: %s" %input_ecu_id)
 
-def search_immo_start(input_binary_filename):
+def search_immo_start(rom):
 
-    with open(input_binary_filename, 'rb') as file:
+    #skip past bootloader, we know it's not there
+    address = rom.find(immo_start_pattern, 0x2000, 0x80000)
+    if address < 0:
+        print("Immo not found or string incorrect")
+        return None
 
-        #seek past bootloader, we know it's not there
-        file.seek(0x2000)
-    
-        while True:
-
-            hexdata = file.read(1).hex().upper()
-
-            if re.search(immo_start_pattern[:2], hexdata):
-                #print("Potential Start of Immo")
-                
-                hexdata = file.read(15).hex().upper()
-                if re.search(immo_start_pattern[2:32], hexdata):
-                    address = hex(file.tell()- 16) 
-                    print(f"Start of Immo Found at {address}")
-                    return address
-            if file.tell() >= (int(0x80000) - 16):
-                print("Immo not found or string incorrect")
-                break;
-
-def get_immo_patch_addresses(start_address,input_binary_filename):
-
-    address1_address = hex(int(start_address,0) + address1_offset)
-    address2_address = hex(int(address1_address,0) + address2_offset)
-    address3_address = hex(int(address2_address,0) + address3_offset)
-    w_rke_address = hex(int(start_address,0) + w_rke_offset)
-
-    with open(input_binary_filename, 'rb') as file:
-        file.seek(int(address1_address,0))
-        address1_val = file.read(2).hex().upper()
-        #print(address1_val)
-        file.seek(int(address2_address,0))
-        address2_val = file.read(2).hex().upper()
-        #print(address2_val)
-        file.seek(int(address3_address,0))
-        address3_val = file.read(2).hex().upper()
-        #print(address3_val)
-
-        return address1_val, address2_val, address3_val, w_rke_address
+    print(f"Start of Immo Found at {address:#x}")
+    return address
+
+def get_immo_patch_addresses(start_address,rom):
+
+    address1 = start_address + address1_offset
+    address2 = address1 + address2_offset
+    address3 = address2 + address3_offset
+    w_rke_address = start_address + w_rke_offset
+
+    address1_val = rom[address1:address1 + 2].hex(" ").upper()
+    #print(address1_val)
+    address2_val = rom[address2:address2 + 2].hex(" ").upper()
+    #print(address2_val)
+    address3_val = rom[address3:address3 + 2].hex(" ").upper()
+    #print(address3_val)
+
+    return address1_val, address2_val, address3_val, w_rke_address
 
 def write_immo_patch_defs(start_address,val1,val2,val3,val4,file):
 
-    val1 = val1[:2] + " " + val1[2:4]
-    val2 = val2[:2] + " " + val2[2:4]
-    val3 = val3[:2] + " " + val3[2:4]
+    on_data = immo_patch_on_start + immo_patch_body.format(val1=val1, val2=val2, val3=val3, tail="00")
+    off_data = immo_patch_off_start + immo_patch_body.format(val1=val1, val2=val2, val3=val3, tail="01")
 
     print("Writing Def file")
-    with open(file, "w") as file:   
-        file.write(f"<table name=\"Immobilizer Disable - Without RKE Installed\" storageaddress=\"{start_address}\">\n") 
-        file.write(f"\t<state name=\"on\" data=\"00 09 00 09 00 09 B3 D5 00 09 00 09 00 09 00 09 00 09 00 09 00 09 00\n \
-		            09 00 09 00 09 00 09 00 09 00 09 00 09 00 09 00 09 00 09 00 09 00 09\n \
-		            00 09 00 09 00 09 A0 3D 00 09 01 F4 00 FA 55 AA AA CC B5 C4 FF FF FF\n \
-		            FF 86 9C 00 03 {val1} 00 03 {val2} FF FF C2 28 FF FF C2 2C FF FF C2 3E\n \
-		            FF FF C2 3A FF FF C2 88 FF FF C2 8C 00 01 00 01 55 AA 55 AA 00 00 FF\n \
-		            FF FF FF C2 96 FF FF C2 98 00 00 B7 E3 FF FF C2 39 00 03 {val3} B0 BB\n \
-		            00 09 A0 11 00 09 B1 CF 00 09 A0 0D 00 09 B2 5B 00 09 A0 09 00 09 B2\n \
-		            FD 00 09 A0 05 00 09 B3 4E 00 09 A0 01 00 09 2D E0 DD 30 D2 30 64 20\n \
-		            60 4C 88 05 8D 04 64 03 60 43 88 06 8F 10 00 09 D2 2C 63 20 23 38 8F\n \
-		            0B 00 09 D1 2B 60 10 20 08 8F 06 00 09 D2 29 E5 01 42 0B 64 D0 A0 01\n \
-		            2D 00 2D E0 E3 03 62 D0 62 2C 32 33 8F 0D 00 09 E1 00\"/>\n \
-			<state name=\"off\" data=\"B5 6E 00 09 60 D0 60 0C 88 00 8D 11 00 09 88 01 8D 3A 00 09 88 02 8D\n \
-					3B 00 09 88 03 8D 3C 00 09 88 04 8D 3D 00 09 88 05 8D 3E 00 09 A0 40\n \
-					00 09 B0 8C 00 09 A0 3D 00 09 01 F4 00 FA 55 AA AA CC B5 C4 FF FF FF\n \
-					FF 86 9C 00 03 {val1} 00 03 {val2} FF FF C2 28 FF FF C2 2C FF FF C2 3E\n \
-					FF FF C2 3A FF FF C2 88 FF FF C2 8C 00 01 00 01 55 AA 55 AA 00 00 FF\n \
-					FF FF FF C2 96 FF FF C2 98 00 00 B7 E3 FF FF C2 39 00 03 {val3} B0 BB\n \
-					00 09 A0 11 00 09 B1 CF 00 09 A0 0D 00 09 B2 5B 00 09 A0 09 00 09 B2\n \
-					FD 00 09 A0 05 00 09 B3 4E 00 09 A0 01 00 09 2D E0 DD 30 D2 30 64 20\n \
-					60 4C 88 05 8D 04 64 03 60 43 88 06 8F 10 00 09 D2 2C 63 20 23 38 8F\n \
-					0B 00 09 D1 2B 60 10 20 08 8F 06 00 09 D2 29 E5 01 42 0B 64 D0 A0 01\n \
-					2D 00 2D E0 E3 03 62 D0 62 2C 32 33 8F 0D 00 09 E1 01\" />\n \
-		</table>\n\n")
-        file.write(f"<table name=\"Immobilizer Disable - With RKE Installed\" storageaddress=\"{val4}\">\n") 
+    with open(file, "w") as file:
+        file.write(f"<table name=\"Immobilizer Disable - Without RKE Installed\" storageaddress=\"{start_address:#x}\">\n")
+        file.write(f"\t<state name=\"on\" data=\"{on_data}\"/>\n")
+        file.write(f"\t<state name=\"off\" data=\"{off_data}\" />\n")
+        file.write("</table>\n\n")
+        file.write(f"<table name=\"Immobilizer Disable - With RKE Installed\" storageaddress=\"{val4:#x}\">\n")
 
 def main():
 
@@ -114,10 +93,16 @@ def main():
     # Parse arguments
     args = parser.parse_args()
 
+    #ROM is under 1MB, read it once and work on it in memory
+    with open(args.binary_file, 'rb') as file:
+        rom = file.read()
+
     #Check ECU ID
-    search_input(args.binary_file)
-    immo_start_address = search_immo_start(args.binary_file)
-    val1, val2, val3, val4 = get_immo_patch_addresses(immo_start_address,args.binary_file)
+    search_input(rom)
+    immo_start_address = search_immo_start(rom)
+    if immo_start_address is None:
+        sys.exit(1)
+    val1, val2, val3, val4 = get_immo_patch_addresses(immo_start_address,rom)
     write_immo_patch_defs(immo_start_address,val1, val2, val3, val4, output_file)
     print("File written, copy into ECU Defs XML")
     